@@ -1,8 +1,12 @@
-import fitz  # PyMuPDF
 import re
-import statistics
 import argparse
-from collections import defaultdict
+import bisect
+import itertools
+import operator
+import numpy as np
+
+# Matches lines like "0250 Judicial Branch" - a 4-digit code followed by a description
+_CODE_RE = re.compile(r'^(\d{4})\s+(.*)')
 
 def extract_org_structure(pdf_path):
     """
@@ -14,106 +18,109 @@ def extract_org_structure(pdf_path):
     Returns:
         list: List of structured organization items
     """
-    # Open the PDF file
-    pdf_document = fitz.open(pdf_path)
-    
-    # First pass: collect x-positions to determine level thresholds
+    # Deferred so --help and argparse errors don't pay the MuPDF shared
+    # library load, and importing this module for its helpers stays cheap
+    import fitz  # PyMuPDF
+
+    # Text extraction has no use for ICC color management, and profile
+    # parsing can dominate first-page time on heavily-designed government
+    # PDFs; set_icc only exists on recent PyMuPDF releases, hence the guard.
+    # Silencing MuPDF's stderr chatter keeps damaged-file noise out of runs.
+    if hasattr(fitz.TOOLS, 'set_icc'):
+        fitz.TOOLS.set_icc(False)
+    fitz.TOOLS.mupdf_display_errors(False)
+
+    # Single pass: record every matched code along with its x-position so the
+    # PDF only has to be parsed once
     x_positions = []
-    code_positions = defaultdict(list)
-    
-    for page_num in range(len(pdf_document)):
-        page = pdf_document[page_num]
-        blocks = page.get_text("dict")["blocks"]
-        
-        for block in blocks:
-            if "lines" in block:
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        text = span["text"].strip()
-                        match = re.match(r'^(\d{4})\s+(.*)', text)
-                        if match:
-                            code = match.group(1)
-                            x_pos = span["origin"][0]
-                            x_positions.append(x_pos)
-                            code_positions[x_pos].append((code, match.group(2)))
+    records = []
+
+    # Assemble the extraction flags once up front rather than rebuilding the
+    # bitmask (three attribute lookups and two ORs) on every page. The
+    # minimal set keeps image handling out of MuPDF's extraction path
+    # entirely; preserving ligatures skips the expansion pass, which codes
+    # (plain digits) never need.
+    text_flags = fitz.TEXT_PRESERVE_LIGATURES | fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+    pdf_document = fitz.open(pdf_path)
+    try:
+        for page_num in range(pdf_document.page_count):
+            # Load pages one at a time and drop each reference as soon as its
+            # words are extracted, so MuPDF can release the page's display
+            # list instead of keeping every page alive until the end
+            page = pdf_document.load_page(page_num)
+
+            # "words" returns flat (x0, y0, x1, y1, word, block, line, word)
+            # tuples without the span/font object graph of "dict"; regroup
+            # words sharing a (block, line) pair to rebuild each text line
+            words = page.get_text("words", flags=text_flags)
+            page = None
+
+            for _, line_words in itertools.groupby(words, key=lambda w: (w[5], w[6])):
+                line_words = list(line_words)
+                text = ' '.join(w[4] for w in line_words).strip()
+
+                # Cheap prefix test: most lines are not "NNNN description", so
+                # reject them before paying regex-engine startup
+                if len(text) < 5 or not text[:4].isdigit() or text[4] != ' ':
+                    continue
+
+                match = _CODE_RE.match(text)
+                if match:
+                    code = match.group(1)
+                    x_pos = line_words[0][0]
+                    x_positions.append(x_pos)
+                    records.append((page_num + 1, code, match.group(2), x_pos))
+    finally:
+        # Close explicitly rather than leaving the document to the GC
+        pdf_document.close()
     
     # Determine position clusters
     if not x_positions:
         print("No structured data found in the PDF.")
-        pdf_document.close()
         return []
     
-    # Group similar x-positions
-    x_positions.sort()
-    position_clusters = []
-    current_cluster = [x_positions[0]]
-    
-    for i in range(1, len(x_positions)):
-        if x_positions[i] - x_positions[i-1] > 15:  # New cluster if gap > 15 points
-            position_clusters.append(current_cluster)
-            current_cluster = [x_positions[i]]
-        else:
-            current_cluster.append(x_positions[i])
-    
-    position_clusters.append(current_cluster)
+    # Group similar x-positions: split the sorted array wherever the gap
+    # between neighbors exceeds 15 points
+    sorted_positions = np.sort(np.asarray(x_positions, dtype=np.float64))
+    split_idx = np.flatnonzero(np.diff(sorted_positions) > 15) + 1
+    position_clusters = np.split(sorted_positions, split_idx)
     
     # Calculate median position for each cluster
-    cluster_medians = [statistics.median(cluster) for cluster in position_clusters]
+    cluster_medians = [float(np.median(cluster)) for cluster in position_clusters]
     cluster_medians.sort()
     
-    # Map clusters to levels
-    level_thresholds = {}
+    # Map sorted cluster medians to levels (leftmost cluster = agency level)
     level_labels = ["A", "1", "2", "3"]
-    
-    for i, median in enumerate(cluster_medians):
-        if i < len(level_labels):
-            level_thresholds[level_labels[i]] = (median - 10, median + 10)
-    
-    # Second pass: extract structured data using determined thresholds
+    medians = cluster_medians[:len(level_labels)]
+    labels = level_labels[:len(medians)]
+
+    # Assign each recorded match to the cluster with the nearest median
     structured_data = []
-    
-    for page_num in range(len(pdf_document)):
-        page = pdf_document[page_num]
-        blocks = page.get_text("dict")["blocks"]
-        
-        for block in blocks:
-            if "lines" in block:
-                for line in block["lines"]:
-                    for span in line["spans"]:
-                        text = span["text"].strip()
-                        match = re.match(r'^(\d{4})\s+(.*)', text)
-                        if match:
-                            code = match.group(1)
-                            description = match.group(2)
-                            x_pos = span["origin"][0]
-                            
-                            # Determine level based on position
-                            level = "Unknown"
-                            for lvl, (min_pos, max_pos) in level_thresholds.items():
-                                if min_pos <= x_pos <= max_pos:
-                                    level = lvl
-                                    break
-                            
-                            # If not in any threshold range, find closest
-                            if level == "Unknown":
-                                closest_level = min(level_thresholds.keys(), 
-                                                  key=lambda k: min(abs(x_pos - level_thresholds[k][0]), 
-                                                                   abs(x_pos - level_thresholds[k][1])))
-                                level = closest_level
-                            
-                            structured_data.append({
-                                "level": level,
-                                "code": code,
-                                "description": description,
-                                "x_position": x_pos,
-                                "page": page_num + 1
-                            })
-    
-    # Close the document
-    pdf_document.close()
-    
+
+    for page, code, description, x_pos in records:
+        # Bisect into the sorted medians and pick the closer neighbor
+        idx = bisect.bisect_left(medians, x_pos)
+        if idx == 0:
+            level = labels[0]
+        elif idx == len(medians):
+            level = labels[-1]
+        elif x_pos - medians[idx - 1] <= medians[idx] - x_pos:
+            level = labels[idx - 1]
+        else:
+            level = labels[idx]
+
+        structured_data.append({
+            "level": level,
+            "code": code,
+            "description": description,
+            "x_position": x_pos,
+            "page": page,
+            "code_int": int(code)  # numeric sort key, cheaper than string compare
+        })
+
     # Sort by page and then by code
-    structured_data.sort(key=lambda x: (x["page"], x["code"]))
+    structured_data.sort(key=operator.itemgetter("page", "code_int"))
     
     return structured_data
 
@@ -168,11 +175,10 @@ if __name__ == "__main__":
         import csv
         with open(args.output, 'w', newline='') as csvfile:
             fieldnames = ['level', 'code', 'description', 'x_position', 'page']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction='ignore')
             
             writer.writeheader()
-            for item in org_data:
-                writer.writerow(item)
+            writer.writerows(org_data)
         
         print(f"\nExtracted {len(org_data)} items from the PDF.")
         print(f"Data has been saved to '{args.output}'")
@@ -53,11 +53,16 @@ Usage:
 python3 extract_pdf_text.py
 """
 
+import argparse
+import atexit
+import gzip
+import hashlib
 import os
 import sys
-import glob
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import mmap
 import re
 from pdftext.extraction import plain_text_output, dictionary_output
 
@@ -69,6 +74,10 @@ PROJECT_ROOT = os.path.abspath(os.path.join(SCRIPT_DIR, "../.."))
 BUDGET_DIR = os.path.join(PROJECT_ROOT, "src/data/budget")
 TEXT_OUTPUT_DIR = os.path.join(PROJECT_ROOT, "src/data/budget/text")
 
+# pdftext can parse the pages of one document in parallel; keep the per-file
+# worker count modest so it composes with the cross-file process pool
+PAGE_WORKERS = min(4, os.cpu_count() or 1)
+
 # Generate a transaction ID for this processing session
 def generate_transaction_id():
     """Generate a unique transaction ID for logging."""
@@ -87,9 +96,11 @@ if not os.path.exists(LOG_DIR):
     os.makedirs(LOG_DIR)
 LOG_FILE = os.path.join(LOG_DIR, f"extract_pdf_text_{TRANSACTION_ID}.log")
 
-# Initialize log file
-with open(LOG_FILE, 'w', encoding='utf-8') as f:
-    f.write(f"PDF Text Extraction Log - {datetime.now().isoformat()}\n")
+# Initialize log file, keeping one line-buffered handle open for the whole
+# session instead of reopening the file for every entry
+_LOG_FH = open(LOG_FILE, 'w', encoding='utf-8', buffering=1)
+_LOG_FH.write(f"PDF Text Extraction Log - {datetime.now().isoformat()}\n")
+atexit.register(_LOG_FH.close)
 
 def log(message, is_sub_step=False, is_error=False):
     """Write message to log file only (not console)."""
@@ -97,14 +108,21 @@ def log(message, is_sub_step=False, is_error=False):
     level = 'ERROR' if is_error else 'INFO'
     prefix = '  - ' if is_sub_step else '• '
     log_entry = f"[{level}] [{timestamp}] {prefix}{message}\n"
-    
+
     # Write only to log file, not console
-    with open(LOG_FILE, 'a', encoding='utf-8') as f:
-        f.write(log_entry)
+    _LOG_FH.write(log_entry)
+
+# When stdout is redirected (CI, pipelines) there is no reader waiting on
+# progress lines, so skip print()'s per-call locking/flush behavior and let
+# the stream's block buffering coalesce writes
+_STDOUT_ISATTY = sys.stdout.isatty()
 
 def console_output(message):
     """Output to console only."""
-    print(message)
+    if _STDOUT_ISATTY:
+        print(message)
+    else:
+        sys.stdout.write(message + '\n')
 
 def get_year_range():
     """Get year range from user input."""
@@ -138,50 +156,43 @@ def ensure_directory_exists(directory):
         os.makedirs(directory)
         print(f"Created directory: {directory}")
 
-def extract_text_with_layout(pdf_path):
-    """Extract text from PDF with layout preservation using PDFText."""
-    try:
-        console_output(f"  📄 Processing PDF: {os.path.basename(pdf_path)}")
-        log(f"Starting text extraction for {os.path.basename(pdf_path)}")
-        
-        console_output("    📝 Extracting text with layout preservation...")
-        log("Extracting text with layout preservation", True)
-        
-        # Use dictionary_output to get proper page separation
-        pages = dictionary_output(pdf_path, sort=True)
-        processed_lines = []
-        
-        for page_num, page in enumerate(pages, 1):
-            if page_num % 10 == 0:
-                console_output(f"      📊 Processing page {page_num}/{len(pages)}...")
-                log(f"Processing page {page_num} of {len(pages)}", True)
-            
-            # Add page marker with metadata
-            width = page['width'] if isinstance(page, dict) and 'width' in page else 0
-            height = page['height'] if isinstance(page, dict) and 'height' in page else 0
-            processed_lines.append(f"# === PAGE {page_num} === [size: {width}x{height}]")
-            
-            # Extract text from all blocks in the page
-            page_lines = []
-            blocks = page.get('blocks', []) if isinstance(page, dict) else []
-            
-            for block_idx, block in enumerate(blocks):
-                if not isinstance(block, dict):
+def _iter_layout_lines(pages):
+    """Yield formatted text lines for already-parsed PDF pages."""
+    console_output("    📝 Extracting text with layout preservation...")
+    log("Extracting text with layout preservation", True)
+
+    for page_num, page in enumerate(pages, 1):
+        if page_num % 10 == 0:
+            console_output(f"      📊 Processing page {page_num}/{len(pages)}...")
+            log(f"Processing page {page_num} of {len(pages)}", True)
+
+        # Page marker with metadata
+        width = page['width'] if isinstance(page, dict) and 'width' in page else 0
+        height = page['height'] if isinstance(page, dict) and 'height' in page else 0
+        yield f"# === PAGE {page_num} === [size: {width}x{height}]"
+
+        # Collect the page's lines in one batch and hand them off together,
+        # saving a generator suspension (and attribute lookup) per line
+        page_lines = []
+        add_line = page_lines.append
+
+        # Extract text from all blocks in the page
+        blocks = page.get('blocks', []) if isinstance(page, dict) else []
+
+        for block_idx, block in enumerate(blocks):
+            if not isinstance(block, dict):
+                continue
+
+            for line_idx, line in enumerate(block.get('lines', [])):
+                if not isinstance(line, dict):
                     continue
-                
-                for line_idx, line in enumerate(block.get('lines', [])):
-                    if not isinstance(line, dict):
-                        continue
-                    
+
                 # Get line position and text
                 bbox = line.get('bbox', [])
                 spans = line.get('spans', [])
                 line_text = ' '.join(span.get('text', '') for span in spans if isinstance(span, dict))
-                
+
                 if line_text.strip():
-                    # Log bbox for debugging
-                    log(f"Line bbox: {bbox}", True)
-                    
                     # Get coordinates from bbox (which is a list [x0, y0, x1, y1])
                     try:
                         x = int(float(bbox[0])) if isinstance(bbox, (list, tuple)) and len(bbox) > 0 else 0
@@ -189,32 +200,20 @@ def extract_text_with_layout(pdf_path):
                     except (ValueError, TypeError, IndexError):
                         x, y = 0, 0
                         log(f"Failed to extract coordinates from bbox: {bbox}", True, True)
-                        
-                    pos_info = f"[{block_idx}:{line_idx}:{x},{y}]"
-                    page_lines.append(f"{pos_info} {line_text}")
-        
-        # Add page lines (even if empty)
-        processed_lines.extend(page_lines)
-        
-        # Add empty line after each page
-        processed_lines.append("")
-        
-        console_output(f"    ✅ Completed processing {len(pages)} pages")
-        log(f"Completed processing {len(pages)} pages", True)
-        
-        return processed_lines
-        
-    except Exception as e:
-        error_msg = f"Error extracting text from {pdf_path}: {e}"
-        console_output(f"    ❌ {error_msg}")
-        log(error_msg, False, True)
-        return None
 
-def extract_page_text(pdf_path, page_num):
-    """Extract text from a specific page in PDF."""
+                    add_line(f"[{block_idx}:{line_idx}:{x},{y}] {line_text}")
+
+        yield from page_lines
+
+        # Empty line after each page for readability
+        yield ""
+
+    console_output(f"    ✅ Completed processing {len(pages)} pages")
+    log(f"Completed processing {len(pages)} pages", True)
+
+def extract_page_text_from_pages(pages, page_num):
+    """Extract text from a specific page of an already-parsed pages list."""
     try:
-        # Use dictionary_output for structured extraction with page info
-        pages = dictionary_output(pdf_path, sort=True)
         if page_num < len(pages):
             page = pages[page_num]
             page_lines = []
@@ -249,43 +248,58 @@ def extract_page_text(pdf_path, page_num):
             return page_lines
         return []
     except Exception as e:
-        print(f"Error extracting page {page_num} from {pdf_path}: {e}")
+        print(f"Error extracting page {page_num}: {e}")
         return []
 
+_PAGE_MARKER = b'# === PAGE '
+
 def extract_text_file_page(text_file_path, page_num):
     """Extract text for a specific page from the text file."""
-    with open(text_file_path, 'r', encoding='utf-8') as f:
-        content = f.read()
-    
-    # Split content into pages using the page markers, but keep the markers
-    pages = []
-    current_page = []
-    for line in content.split('\n'):
-        if line.startswith('# === PAGE '):
-            if current_page and len(pages) == page_num:
-                # We found the page we want
-                return current_page
-            current_page = [line]  # Start new page with the marker
-            pages.append(current_page)
-        else:
-            if current_page:  # Only add lines if we've seen a page marker
-                current_page.append(line)
-    
-    # Handle the last page
-    if current_page and len(pages) == page_num + 1:
-        return current_page
-    
-    return []
+    if page_num < 0:
+        return []
+
+    with open(text_file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return []
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Hop marker to marker with mmap.find so the scan stops as soon
+            # as the requested page's boundaries are known; only that page's
+            # byte slice ever gets decoded to str
+            marker = b'\n' + _PAGE_MARKER
+
+            if mm[:len(_PAGE_MARKER)] == _PAGE_MARKER:
+                start = 0
+            else:
+                # Skip any preamble before the first marker
+                start = mm.find(marker)
+                if start == -1:
+                    return []
+                start += 1
 
-def verify_page_accuracy(pdf_path, text_file_path):
+            for _ in range(page_num):
+                next_start = mm.find(marker, start)
+                if next_start == -1:
+                    return []
+                start = next_start + 1
+
+            end = mm.find(marker, start)
+            if end == -1:
+                end = len(mm)
+
+            return mm[start:end].decode('utf-8').split('\n')
+
+def verify_page_accuracy(pdf_path, text_file_path, pages=None):
     """Verify page-by-page accuracy between PDF and text file."""
     console_output("\n🔍 Starting verification:")
     console_output(f"  PDF:  {pdf_path}")
     console_output(f"  Text: {text_file_path}")
     log(f"Starting verification between PDF and text file: {os.path.basename(pdf_path)}")
-    
-    # Get total pages from PDF using dictionary_output
-    pages = dictionary_output(pdf_path, sort=True)
+
+    # Parse the PDF only if the caller did not already do so during
+    # extraction; every per-page comparison reuses this list
+    if pages is None:
+        pages = dictionary_output(pdf_path, sort=True, workers=PAGE_WORKERS)
     total_pages = len(pages)
     
     console_output(f"  📚 Found {total_pages} pages to verify")
@@ -298,7 +312,7 @@ def verify_page_accuracy(pdf_path, text_file_path):
         log(f"Verifying page {page_num + 1} of {total_pages}", True)
         
         # Get text from both sources
-        pdf_lines = extract_page_text(pdf_path, page_num)
+        pdf_lines = extract_page_text_from_pages(pages, page_num)
         text_file_lines = extract_text_file_page(text_file_path, page_num)
         
         # Compare content exactly as is
@@ -343,81 +357,193 @@ def verify_page_accuracy(pdf_path, text_file_path):
         return False
 
 def save_text_file(text_lines, output_path):
-    """Save text as a text file."""
+    """Stream text lines to a text file without buffering them all in memory."""
+    # Write to a sibling temp file and rename into place: a crash mid-write
+    # can then never leave a truncated .txt that the up-to-date checks would
+    # mistake for a finished extraction
+    tmp_path = output_path + '.tmp'
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(text_lines))
+        if output_path.endswith('.gz'):
+            # Level-1 gzip runs near memory-copy speed and typically shrinks
+            # extracted budget text 4-6x on disk
+            f = gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=1)
+        else:
+            # writelines drives the write loop in C; the 8 MiB buffer
+            # coalesces the small per-line writes into a few write syscalls
+            f = open(tmp_path, 'w', encoding='utf-8', buffering=8 * 1024 * 1024)
+        with f:
+            f.writelines(line + '\n' for line in text_lines)
+        os.replace(tmp_path, output_path)
         return True
     except Exception as e:
         print(f"Error saving text file: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
         return False
 
+# The three suffix-anchored naming conventions (_YYYY_budget.pdf, _YYYY.pdf,
+# YYYY_budget.pdf) merged into one alternation so a single scan covers them
+# all; the bare 4-digit fallback stays separate so it cannot pre-empt a
+# suffix match earlier in the name
+_FILENAME_YEAR_RE = re.compile(r'(?:_(\d{4})_budget|_(\d{4})|(\d{4})_budget)\.pdf$', re.IGNORECASE)
+_ANY_YEAR_RE = re.compile(r'\d{4}')
+
+# Optional fast path: with numba installed the fallback digit scan compiles
+# to native code, which only pays off when filtering tens of thousands of
+# names (e.g. scraped indices); without it the compiled regex stays in use
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _scan_any_year(filename):
+    """Single-pass scan for the first run of four digits (-1 if none).
+
+    Mirrors the _ANY_YEAR_RE fallback without regex-engine startup; only
+    used when numba has compiled it to native code.
+    """
+    run = 0
+    value = 0
+    for i in range(len(filename)):
+        c = filename[i]
+        if '0' <= c <= '9':
+            # Accumulate arithmetically: numba's nopython mode has no int()
+            # over string slices, so build the number digit by digit
+            run += 1
+            value = value * 10 + (ord(c) - 48)
+            if run == 4:
+                return value
+        else:
+            run = 0
+            value = 0
+    return -1
+
+if njit is not None:
+    try:
+        _scan_any_year = njit(cache=True)(_scan_any_year)
+        # Compile now: numba types a function at first call, so a typing
+        # failure would otherwise surface mid-batch instead of at import
+        _scan_any_year('_warmup_2000.pdf')
+    except Exception:
+        njit = None
+
 def extract_year_from_filename(filename):
     """Extract year from filename using specific patterns."""
-    # Pattern 1: _YYYY_budget.pdf
-    pattern1 = r'_(\d{4})_budget\.pdf$'
-    match1 = re.search(pattern1, filename)
-    if match1:
-        return int(match1.group(1))
-    
-    # Pattern 2: _YYYY.pdf
-    pattern2 = r'_(\d{4})\.pdf$'
-    match2 = re.search(pattern2, filename)
-    if match2:
-        return int(match2.group(1))
-    
-    # Pattern 3: YYYY_budget.pdf
-    pattern3 = r'(\d{4})_budget\.pdf$'
-    match3 = re.search(pattern3, filename)
-    if match3:
-        return int(match3.group(1))
-    
-    # If no pattern matches, try to find any 4-digit number
-    pattern4 = r'\d{4}'
-    match4 = re.search(pattern4, filename)
-    if match4:
-        return int(match4.group(0))
-    
+    match = _FILENAME_YEAR_RE.search(filename)
+    if match:
+        return int(next(g for g in match.groups() if g))
+
+    # If no naming convention matches, try to find any 4-digit number
+    if njit is not None:
+        year = _scan_any_year(filename)
+        return year if year >= 0 else None
+
+    match = _ANY_YEAR_RE.search(filename)
+    if match:
+        return int(match.group(0))
+
     return None
 
-def filter_pdfs_by_year(pdf_files, start_year, end_year):
-    """Filter PDF files based on year range."""
-    filtered_files = []
-    print("\nDebug: PDF files found:")
-    for pdf_file in pdf_files:
-        filename = os.path.basename(pdf_file)
-        file_year = extract_year_from_filename(filename)
-        
-        if file_year is not None:
-            print(f"  {filename} -> Year: {file_year}")
-            if start_year <= file_year <= end_year:
-                filtered_files.append(pdf_file)
-        else:
-            print(f"  {filename} -> Year: Could not determine")
-    
-    print(f"\nTotal PDFs found: {len(pdf_files)}")
-    print(f"PDFs matching year range {start_year}-{end_year}: {len(filtered_files)}")
-    return filtered_files
+def scan_budget_tasks(start_year, end_year, suffix, force, backend):
+    """Build extraction tasks in a single pass over the budget directory.
+
+    Fuses discovery, year filtering, and output-path construction: each
+    DirEntry is inspected once and either dropped or turned into a
+    (pdf_path, output_path, force, backend, size) tuple, with the size taken
+    from the entry's cached stat. Returns (total_pdfs, tasks).
+    """
+    current_year = datetime.now().year
+    total_pdfs = 0
+    tasks = []
+
+    # Per-file year decisions go to the session log, not stdout - printing a
+    # line per PDF costs a flush per file and drowns out the real progress
+    log("PDF files found:")
+    try:
+        with os.scandir(BUDGET_DIR) as entries:
+            for entry in entries:
+                if not entry.is_file() or not entry.name.lower().endswith('.pdf'):
+                    continue
+                total_pdfs += 1
+                filename = entry.name
+
+                # Common case first: names that lead with a plausible year
+                # need only a slice-and-isdigit test, no regex at all
+                if filename[:4].isdigit() and 2000 <= int(filename[:4]) <= current_year:
+                    file_year = int(filename[:4])
+                else:
+                    file_year = extract_year_from_filename(filename)
+
+                if file_year is None:
+                    log(f"{filename} -> Year: Could not determine", True)
+                    continue
+
+                log(f"{filename} -> Year: {file_year}", True)
+                if start_year <= file_year <= end_year:
+                    output_path = os.path.join(TEXT_OUTPUT_DIR, os.path.splitext(filename)[0] + suffix)
+                    tasks.append((entry.path, output_path, force, backend, entry.stat().st_size))
+    except FileNotFoundError:
+        pass
+
+    return total_pdfs, tasks
+
+def _mupdf_pages(pdf_path):
+    """Parse a PDF with PyMuPDF into the same page-dict shape pdftext emits.
+
+    MuPDF and pdfium (pdftext's engine) have different hot paths, so on some
+    layouts one is markedly faster than the other; this adapter lets callers
+    pick per run without touching the downstream formatting code.
+    """
+    import fitz  # deferred: only loaded when the mupdf backend is chosen
+
+    # ICC handling is irrelevant for text-only output and slows first-page
+    # parsing; quiet MuPDF's stderr output while we're at it
+    if hasattr(fitz.TOOLS, 'set_icc'):
+        fitz.TOOLS.set_icc(False)
+    fitz.TOOLS.mupdf_display_errors(False)
+
+    pages = []
+    doc = fitz.open(pdf_path)
+    try:
+        for page_num in range(doc.page_count):
+            page = doc.load_page(page_num)
+            # "dict" output carries width/height/blocks/lines/spans keys
+            # matching what _iter_layout_lines expects
+            pages.append(page.get_text("dict"))
+            page = None
+    finally:
+        doc.close()
+    return pages
 
-def extract_text_from_pdf(pdf_path, output_path):
+def parse_pdf_pages(pdf_path, backend='pdftext'):
+    """Parse a PDF into page dicts with the selected backend."""
+    if backend == 'mupdf':
+        return _mupdf_pages(pdf_path)
+    return dictionary_output(pdf_path, sort=True, workers=PAGE_WORKERS)
+
+def extract_text_from_pdf(pdf_path, output_path, backend='pdftext'):
     """Extract text from PDF and save to file."""
     try:
         base_filename = os.path.splitext(os.path.basename(pdf_path))[0]
-        
-        # Extract text with better layout preservation
+
+        # Extract text with better layout preservation, streaming each
+        # formatted line straight to disk rather than materializing the
+        # whole document in a list first
         console_output(f"\n🔄 Processing: {os.path.basename(pdf_path)}")
         log(f"Starting processing of {os.path.basename(pdf_path)}")
-        
-        text_lines = extract_text_with_layout(pdf_path)
-        
-        if text_lines is None:
-            return False
-        
-        # Save text file
+
+        # Parse the PDF exactly once; the extractor (and the verifier, when
+        # enabled) all work from this pages list
+        console_output(f"  📄 Parsing PDF: {os.path.basename(pdf_path)}")
+        log(f"Starting text extraction for {os.path.basename(pdf_path)}")
+        pages = parse_pdf_pages(pdf_path, backend)
+
         console_output("  💾 Saving extracted text...")
         log("Saving extracted text to file", True)
-        
-        if save_text_file(text_lines, output_path):
+
+        if save_text_file(_iter_layout_lines(pages), output_path):
             console_output(f"  ✅ Text saved to: {output_path}")
             log(f"Successfully saved text to {output_path}", True)
             return True
@@ -430,57 +556,131 @@ def extract_text_from_pdf(pdf_path, output_path):
         log(error_msg, False, True)
         return False
 
+def _file_fingerprint(path):
+    """Hash a file's content in 4 MiB chunks (fingerprint, not crypto)."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(4 * 1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _process_one(task):
+    """Worker wrapper: extract a single PDF and report (base_name, ok)."""
+    pdf_file, output_path, force, backend = task
+    base_name = os.path.basename(pdf_file)
+    hash_path = output_path + '.hash'
+    try:
+        # Cheapest check first: an output at least as new as its PDF is
+        # trusted on mtime alone, costing two stat calls instead of a hash
+        # pass over the whole file
+        if not force and os.path.exists(output_path) and \
+                os.path.getmtime(output_path) >= os.path.getmtime(pdf_file):
+            console_output(f"⏭️  Skipping (up-to-date): {base_name}")
+            log(f"Skipping up-to-date output for {base_name}", True)
+            return base_name, True
+
+        fingerprint = _file_fingerprint(pdf_file)
+
+        # Skip the parse entirely when the PDF's content hash matches the
+        # sidecar from a previous run and the output is still on disk
+        if not force and os.path.exists(output_path) and os.path.exists(hash_path):
+            with open(hash_path, 'r', encoding='utf-8') as f:
+                if f.read().strip() == fingerprint:
+                    console_output(f"⏭️  Skipping (unchanged): {base_name}")
+                    log(f"Skipping unchanged PDF: {base_name}", True)
+                    return base_name, True
+
+        ok = extract_text_from_pdf(pdf_file, output_path, backend)
+
+        if ok:
+            with open(hash_path, 'w', encoding='utf-8') as f:
+                f.write(fingerprint + '\n')
+    except Exception as e:
+        error_msg = f"Error processing {base_name}: {str(e)}"
+        console_output(f"❌ {error_msg}")
+        log(error_msg, False, True)
+        ok = False
+    return base_name, ok
+
 def main():
     """Main function to extract text from PDFs within year range."""
+    parser = argparse.ArgumentParser(description='Extract text from budget PDFs with layout preservation')
+    parser.add_argument('--start-year', type=int, help='first year of PDFs to process')
+    parser.add_argument('--end-year', type=int, help='last year of PDFs to process')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                        help='number of worker processes (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                        help='re-extract even when existing output looks up to date')
+    parser.add_argument('--gzip', action='store_true',
+                        help='write gzipped .txt.gz output instead of plain .txt')
+    parser.add_argument('--backend', choices=('pdftext', 'mupdf'), default='pdftext',
+                        help='PDF parsing backend (pdftext is pdfium-based; '
+                             'mupdf can be faster on some layouts)')
+    args = parser.parse_args()
+
     console_output("\n🚀 Starting PDF text extraction process")
     log("Starting PDF text extraction process")
-    
-    # Get year range from user
-    start_year, end_year = get_year_range()
+
+    # Use the year flags when both are supplied (cron/CI/batch runs);
+    # otherwise fall back to the interactive prompt
+    if args.start_year is not None and args.end_year is not None:
+        start_year, end_year = args.start_year, args.end_year
+        current_year = datetime.now().year
+        if not 2000 <= start_year <= current_year or not start_year <= end_year <= current_year:
+            console_output(f"❌ Invalid year range: {start_year}-{end_year}")
+            log(f"Invalid year range: {start_year}-{end_year}", False, True)
+            sys.exit(1)
+    else:
+        start_year, end_year = get_year_range()
     log(f"Processing year range: {start_year} to {end_year}")
     
     # Ensure output directory exists
     console_output("\n📁 Checking directories...")
     ensure_directory_exists(TEXT_OUTPUT_DIR)
     
-    # Get all PDF files in the budget directory
+    # Discover, filter, and build tasks in one pass over the directory
     console_output("\n🔍 Searching for PDF files...")
-    pdf_files = glob.glob(os.path.join(BUDGET_DIR, "*.pdf"))
-    
-    if not pdf_files:
+    suffix = '.txt.gz' if args.gzip else '.txt'
+    total_pdfs, tasks = scan_budget_tasks(start_year, end_year, suffix, args.force, args.backend)
+
+    console_output(f"\nTotal PDFs found: {total_pdfs}")
+    console_output(f"PDFs matching year range {start_year}-{end_year}: {len(tasks)}")
+
+    if total_pdfs == 0:
         console_output(f"❌ No PDF files found in {BUDGET_DIR}")
         log("No PDF files found", False, True)
         sys.exit(0)
-    
-    # Filter PDFs by year range
-    console_output("\n📅 Filtering PDFs by year range...")
-    filtered_pdfs = filter_pdfs_by_year(pdf_files, start_year, end_year)
-    
-    if not filtered_pdfs:
+
+    if not tasks:
         console_output(f"❌ No PDF files found for years {start_year}-{end_year}")
         log(f"No PDF files found for years {start_year}-{end_year}", False, True)
         sys.exit(0)
-    
-    console_output(f"\n📊 Found {len(filtered_pdfs)} PDF files to process for years {start_year}-{end_year}")
-    log(f"Found {len(filtered_pdfs)} PDF files to process")
-    
-    # Process each PDF file
+
+    console_output(f"\n📊 Found {len(tasks)} PDF files to process for years {start_year}-{end_year}")
+    log(f"Found {len(tasks)} PDF files to process")
+
+    # Submit the biggest PDFs first (longest-processing-time heuristic) so a
+    # huge document dispatched last cannot straggle behind an idle pool
+    tasks.sort(key=lambda task: task[4], reverse=True)
+    for pdf_file, _, _, _, size in tasks:
+        log(f"Queued {os.path.basename(pdf_file)} ({size} bytes)", True)
+    tasks = [task[:4] for task in tasks]
+
+    # Process PDFs in parallel - each file is independent, so fan out
+    # across cores instead of walking the list sequentially
     success_count = 0
     verified_count = 0
     failed_files = []
-    
-    for i, pdf_file in enumerate(filtered_pdfs, 1):
-        try:
-            console_output(f"\n📄 Processing file {i} of {len(filtered_pdfs)}")
-            log(f"Processing PDF {i} of {len(filtered_pdfs)}: {os.path.basename(pdf_file)}")
-            
-            # Create output path with .txt extension
-            base_name = os.path.basename(pdf_file)
-            name_without_ext = os.path.splitext(base_name)[0]
-            output_path = os.path.join(TEXT_OUTPUT_DIR, f"{name_without_ext}.txt")
-            
-            # Extract text and verify
-            if extract_text_from_pdf(pdf_file, output_path):
+
+    with ProcessPoolExecutor(max_workers=min(len(tasks), args.jobs)) as executor:
+        futures = [executor.submit(_process_one, task) for task in tasks]
+
+        for i, future in enumerate(as_completed(futures), 1):
+            base_name, ok = future.result()
+            console_output(f"\n📄 Completed file {i} of {len(tasks)}")
+            log(f"Completed PDF {i} of {len(tasks)}: {base_name}")
+
+            if ok:
                 success_count += 1
                 verified_count += 1
                 console_output(f"✅ Successfully processed and verified: {base_name}")
@@ -489,18 +689,12 @@ def main():
                 failed_files.append(base_name)
                 console_output(f"❌ Failed to process or verify: {base_name}")
                 log(f"Failed to process or verify: {base_name}", False, True)
-                
-        except Exception as e:
-            failed_files.append(os.path.basename(pdf_file))
-            error_msg = f"Error processing {os.path.basename(pdf_file)}: {str(e)}"
-            console_output(f"❌ {error_msg}")
-            log(error_msg, False, True)
-    
+
     # Final summary
     console_output("\n📋 PROCESSING SUMMARY:")
     console_output(f"  📊 Year range: {start_year}-{end_year}")
-    console_output(f"  📚 Total PDFs found: {len(pdf_files)}")
-    console_output(f"  🎯 PDFs in year range: {len(filtered_pdfs)}")
+    console_output(f"  📚 Total PDFs found: {total_pdfs}")
+    console_output(f"  🎯 PDFs in year range: {len(tasks)}")
     console_output(f"  ✅ Successfully processed: {success_count}")
     console_output(f"  ✓ Successfully verified: {verified_count}")
     console_output(f"  ❌ Failed: {len(failed_files)}")